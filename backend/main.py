@@ -1,15 +1,108 @@
 # backend/main.py
 
 import os
+import re
+import sys
+import errno
+import asyncio
+import logging
+import tempfile
 import shutil
+import stat
 import json
+import hashlib
 import datetime
+import time
+import threading
+from contextlib import asynccontextmanager
+import functools
 import mimetypes
-from fastapi import FastAPI, HTTPException, File, UploadFile, Form
+from email.utils import formatdate
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from fastapi import FastAPI, HTTPException, File, UploadFile, Form, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
-from pydantic import BaseModel
-from typing import List, Dict, Any, Optional
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
+from fastapi.staticfiles import StaticFiles
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse
+from starlette.staticfiles import NotModifiedResponse
+from pydantic import BaseModel, ConfigDict, ValidationError
+from typing import List, Dict, Any, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # orjson是可选依赖，缺失时退回标准库json
+    orjson = None
+
+# --- 0. 底层文件读写 ---
+# Windows的os.open默认是文本模式，需要显式指定O_BINARY
+_O_BINARY = getattr(os, "O_BINARY", 0)
+
+def read_file_bytes(filepath: str) -> bytes:
+    """Read a whole file with os.open/fstat/read, bypassing the buffered text-IO stack."""
+    fd = os.open(filepath, os.O_RDONLY | _O_BINARY)
+    try:
+        return read_fd(fd, os.fstat(fd).st_size)
+    finally:
+        os.close(fd)
+
+def read_fd(fd: int, size: int) -> bytes:
+    """Read size bytes (the fstat'ed file size) from an open descriptor."""
+    data = os.read(fd, size)
+    if len(data) < size:
+        # A single read() is capped (~2 GiB on Linux); keep reading until EOF
+        parts = [data]
+        remaining = size - len(data)
+        while remaining > 0:
+            chunk = os.read(fd, remaining)
+            if not chunk:
+                break
+            parts.append(chunk)
+            remaining -= len(chunk)
+        data = b"".join(parts)
+    return data
+
+def write_file_bytes(filepath: str, data: bytes, exclusive: bool = False):
+    """Write pre-encoded bytes with os.write, normally in a single syscall.
+
+    With exclusive=True the file must not exist yet (O_EXCL) and FileExistsError is raised otherwise.
+    """
+    mode = os.O_EXCL if exclusive else os.O_TRUNC
+    fd = os.open(filepath, os.O_WRONLY | os.O_CREAT | mode | _O_BINARY, 0o644)
+    try:
+        _write_all(fd, data)
+    finally:
+        os.close(fd)
+
+def _write_all(fd: int, data: bytes):
+    view = memoryview(data)
+    written = 0
+    while written < len(data):
+        written += os.write(fd, view[written:])
+
+def dump_json(obj: Any, indent: bool = False) -> bytes:
+    """Serialize obj to UTF-8 JSON bytes, via orjson when it is installed."""
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None).encode("utf-8")
+
+# --- 3. 新增Pydantic模型用于配置API (新增) ---
+# 放在配置管理之前：加载配置时就要用 ConfigModel 校验 GET /api/config 的响应
+class ProviderDetails(BaseModel):
+    # 只在保存配置时读取一次，不会被修改；旧版本前端多发的字段直接忽略
+    model_config = ConfigDict(extra='ignore', frozen=True)
+
+    api_key: Optional[str] = None
+    base_url: Optional[str] = None
+    model: Optional[str] = None
+
+class ConfigModel(BaseModel):
+    hexo_path: Optional[str] = None
+    llm_provider: str
+    providers: Dict[str, ProviderDetails]
+    scan_prune: List[str] = []
+    parallel_walk: Optional[bool] = None  # None：macOS/Windows上并行遍历，其他平台串行
 
 # --- 1. 配置管理 (新增) ---
 # 定义配置文件的路径
@@ -32,47 +125,260 @@ def load_config() -> Dict[str, Any]:
         save_config(default_config)
         return default_config
     try:
-        with open(CONFIG_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
+        data = read_file_bytes(CONFIG_FILE)
+        return orjson.loads(data) if orjson else json.loads(data)
     except (json.JSONDecodeError, FileNotFoundError):
         # 如果文件损坏或为空，也返回一个默认配置
         return {"hexo_path": None, "llm_provider": "openai", "providers": {}}
 
 
 def save_config(config: Dict[str, Any]):
-    """将配置字典保存到JSON文件。"""
-    with open(CONFIG_FILE, "w", encoding="utf-8") as f:
-        json.dump(config, f, indent=2)
+    """立即更新内存中的配置缓存，并安排把配置字典写入JSON文件。
+
+    后台写入任务运行时只唤醒它，短时间内的多次保存合并为一次写盘；
+    任务未运行时（例如模块导入时创建默认配置）直接同步写入。
+    """
+    global _pending_config
+    _refresh_config_cache(config)
+    _refresh_scan_options(config)
+    _pending_config = config
+    loop, event = _config_loop, _config_dirty
+    if event is None:
+        _flush_config()
+    else:
+        # update_config 运行在线程池中，只能通过事件循环线程安全地 set
+        loop.call_soon_threadsafe(event.set)
+
+# --- 配置写盘去抖 ---
+_CONFIG_WRITE_DELAY = 0.2
+_config_write_lock = threading.Lock()
+_pending_config: Optional[Dict[str, Any]] = None
+_config_loop: Optional[asyncio.AbstractEventLoop] = None
+_config_dirty: Optional[asyncio.Event] = None
+
+def _write_config_file(config: Dict[str, Any]):
+    """Atomically replace CONFIG_FILE: write a temp file in the same directory, then os.replace() it."""
+    data = dump_json(config, indent=True)
+    fd, tmp = tempfile.mkstemp(prefix=".config-", suffix=".tmp",
+                               dir=os.path.dirname(os.path.abspath(CONFIG_FILE)))
+    try:
+        try:
+            _write_all(fd, data)
+        finally:
+            os.close(fd)
+        os.replace(tmp, CONFIG_FILE)
+    except BaseException:
+        os.remove(tmp)
+        raise
+
+def _flush_config():
+    """Write the most recently saved config, if it has not been written yet."""
+    global _pending_config
+    with _config_write_lock:
+        config, _pending_config = _pending_config, None
+        if config is not None:
+            _write_config_file(config)
+
+async def _config_writer():
+    while True:
+        await _config_dirty.wait()
+        await asyncio.sleep(_CONFIG_WRITE_DELAY)
+        _config_dirty.clear()
+        try:
+            await run_in_threadpool(_flush_config)
+        except OSError:
+            logging.getLogger("uvicorn.error").exception("Failed to write %s", CONFIG_FILE)
+
+# GET /api/config 直接返回预先序列化好的JSON和对应的ETag，配置变化时才重新计算
+_config_json: Optional[bytes] = b""
+_config_etag: str = ""
+
+def _refresh_config_cache(config: Dict[str, Any]):
+    """Pre-serialize the config as ConfigModel describes it, so GET /api/config matches its response_model."""
+    global _config_json, _config_etag
+    try:
+        _config_json = dump_json(ConfigModel.model_validate(config).model_dump())
+    except ValidationError:
+        # 与 response_model 校验失败时一样返回500，而不是把不合法的配置原样发给前端
+        _config_json, _config_etag = None, ""
+        return
+    _config_etag = '"' + hashlib.blake2b(_config_json, digest_size=8).hexdigest() + '"'
+
+# 遍历工作目录时不进入的目录名，可通过配置项scan_prune追加
+# 以 . 开头的目录（.trash、.git、.hexo、.deploy_git 等）由 is_pruned_dir 统一跳过，不必列在这里
+_DEFAULT_PRUNE_DIRS = frozenset({"node_modules", "__pycache__"})
+# 只在工作目录根下跳过的目录：public 是 hexo generate 的产物；更深层的同名文件夹可能是用户自己的内容
+_ROOT_PRUNE_DIRS = frozenset({"public"})
+_PRUNE_DIRS = _DEFAULT_PRUNE_DIRS
+# 并行遍历只在APFS/NTFS上有收益，Linux上并发getdents并不更快；配置项parallel_walk可覆盖默认值
+_PARALLEL_WALK_DEFAULT = sys.platform in ("darwin", "win32")
+_PARALLEL_WALK = _PARALLEL_WALK_DEFAULT
+
+def _refresh_scan_options(config: Dict[str, Any]):
+    global _PRUNE_DIRS, _PARALLEL_WALK
+    _PRUNE_DIRS = _DEFAULT_PRUNE_DIRS.union(config.get("scan_prune") or ())
+    parallel = config.get("parallel_walk")
+    _PARALLEL_WALK = _PARALLEL_WALK_DEFAULT if parallel is None else bool(parallel)
 
 # --- 2. 动态路径初始化 (修改) ---
 # 应用启动时，从配置文件加载配置
 app_config = load_config()
+_refresh_config_cache(app_config)
+_refresh_scan_options(app_config)
 # 不再硬编码，而是从加载的配置中读取路径
 HEXO_BASE_PATH = app_config.get("hexo_path") 
 # 直接使用用户指定的路径作为工作目录，不强制要求source/_posts
 POSTS_PATH = HEXO_BASE_PATH if HEXO_BASE_PATH and os.path.isdir(HEXO_BASE_PATH) else None
 
+# 规范化后的工作目录绝对路径及其带分隔符的前缀，只在POSTS_PATH变化时计算一次
+_POSTS_ROOT_ABS: Optional[str] = None
+_POSTS_ROOT_PREFIX: Optional[str] = None
+
+def _set_posts_root(path: Optional[str]):
+    global _POSTS_ROOT_ABS, _POSTS_ROOT_PREFIX
+    if path:
+        _POSTS_ROOT_ABS = os.path.normpath(os.path.abspath(path))
+        _POSTS_ROOT_PREFIX = os.path.join(_POSTS_ROOT_ABS, "")
+    else:
+        _POSTS_ROOT_ABS = None
+        _POSTS_ROOT_PREFIX = None
+
+_set_posts_root(POSTS_PATH)
 
-# --- FastAPI 应用实例 (无变化) ---
-app = FastAPI()
+def safe_join(relative_path: str, base: Optional[str] = None, detail: str = "Invalid path") -> str:
+    """Join relative_path onto base (the workspace root by default) and reject paths that escape it."""
+    if base is None:
+        base, prefix = _POSTS_ROOT_ABS, _POSTS_ROOT_PREFIX
+    else:
+        prefix = os.path.join(base, "")
+    target = os.path.normpath(os.path.join(base, relative_path))
+    if not (target == base or target.startswith(prefix)):
+        raise HTTPException(status_code=400, detail=detail)
+    return target
+
+def workspace_relpath(path: str) -> str:
+    """'/'-separated form of a normalized absolute path below the workspace root, without os.path.relpath."""
+    rel = path[len(_POSTS_ROOT_PREFIX):]
+    return rel.replace(os.sep, "/") if os.sep != "/" else rel
+
+# 拒绝 '..' 路径段、绝对路径和Windows盘符（输入已把反斜杠统一成 '/'）
+_UNSAFE_PATH = re.compile(r'(?:^|/)\.\.(?:/|$)|^/|^[A-Za-z]:')
+
+def trash_root_abs() -> str:
+    return _POSTS_ROOT_PREFIX + ".trash"
+
+# 本进程中已确认存在的目录，避免每次写入都调用os.makedirs逐级stat
+_ensured_dirs = set()
+
+def ensure_dir(path: str):
+    if path not in _ensured_dirs:
+        os.makedirs(path, exist_ok=True)
+        _ensured_dirs.add(path)
+
+def forget_dirs(path: str):
+    """Drop path and everything below it from _ensured_dirs once it has been moved or removed."""
+    prefix = os.path.join(path, "")
+    # 先拍快照再遍历，其他线程可能正在向集合中添加目录
+    _ensured_dirs.difference_update([d for d in tuple(_ensured_dirs) if d == path or d.startswith(prefix)])
+
+def stat_or_none(path: str) -> Optional[os.stat_result]:
+    """os.stat(path), or None if it does not exist; one syscall instead of exists() + isdir()."""
+    try:
+        return os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+def in_parent_dir(path: str, action):
+    """Run action() after making sure path's parent directory exists.
+
+    If the cached parent was removed outside the app, action() fails with FileNotFoundError;
+    the parent is then recreated and action() retried once.
+    """
+    parent = os.path.dirname(path)
+    ensure_dir(parent)
+    try:
+        return action()
+    except FileNotFoundError:
+        forget_dirs(parent)
+        ensure_dir(parent)
+        return action()
+
+
+class PreflightMiddleware:
+    """Answer CORS preflights from the frontend origin with a canned, pre-encoded response.
+
+    Everything else (simple cross-origin requests, other origins) goes on to CORSMiddleware.
+    """
+
+    def __init__(self, app, origin: str, allow_methods: List[str], allow_headers: List[str], max_age: int = 600):
+        self.app = app
+        self.origin = origin.encode("latin-1")
+        self.headers = [
+            (b"access-control-allow-origin", self.origin),
+            (b"access-control-allow-credentials", b"true"),
+            (b"access-control-allow-methods", ", ".join(allow_methods).encode("latin-1")),
+            (b"access-control-allow-headers", ", ".join(allow_headers).encode("latin-1")),
+            (b"access-control-max-age", str(max_age).encode("latin-1")),
+            (b"vary", b"Origin"),
+            (b"content-type", b"text/plain; charset=utf-8"),
+            (b"content-length", b"2"),
+        ]
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["method"] == "OPTIONS":
+            origin = request_method = None
+            for name, value in scope["headers"]:
+                if name == b"origin":
+                    origin = value
+                elif name == b"access-control-request-method":
+                    request_method = value
+            if origin == self.origin and request_method is not None:
+                await send({"type": "http.response.start", "status": 200, "headers": self.headers})
+                await send({"type": "http.response.body", "body": b"OK"})
+                return
+        await self.app(scope, receive, send)
+
+
+# --- FastAPI 应用实例 ---
+FRONTEND_ORIGIN = "http://localhost:3000"
+# 前端只用到这些方法和请求头；固定列表后预检响应不必回显请求头，浏览器可缓存预检结果一天
+CORS_ALLOW_METHODS = ["GET", "POST", "DELETE", "OPTIONS"]
+CORS_ALLOW_HEADERS = ["Content-Type", "If-None-Match"]
+CORS_MAX_AGE = 86400
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run the config writer while the app is up; on shutdown stop it and flush a pending config write."""
+    global _config_loop, _config_dirty
+    _config_loop = asyncio.get_running_loop()
+    _config_dirty = asyncio.Event()
+    writer_task: Optional[asyncio.Task] = asyncio.create_task(_config_writer())
+    try:
+        yield
+    finally:
+        _config_dirty = None  # 之后的保存直接同步写入
+        if writer_task is not None:
+            writer_task.cancel()
+        await run_in_threadpool(_flush_config)
+
+# orjson可用时所有接口默认用它序列化响应
+app = FastAPI(default_response_class=ORJSONResponse if orjson else JSONResponse, lifespan=lifespan)
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["http://localhost:3000"],
+    allow_origins=[FRONTEND_ORIGIN],
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=CORS_ALLOW_METHODS,
+    allow_headers=CORS_ALLOW_HEADERS,
+    max_age=CORS_MAX_AGE,
+)
+# 最后添加的中间件在最外层：前端来源的预检请求在这里直接返回
+app.add_middleware(
+    PreflightMiddleware,
+    origin=FRONTEND_ORIGIN,
+    allow_methods=CORS_ALLOW_METHODS,
+    allow_headers=CORS_ALLOW_HEADERS,
+    max_age=CORS_MAX_AGE,
 )
-
-# --- 3. 新增Pydantic模型用于配置API (新增) ---
-class ProviderDetails(BaseModel):
-    api_key: Optional[str] = None
-    base_url: Optional[str] = None
-    model: Optional[str] = None
-
-class ConfigModel(BaseModel):
-    hexo_path: Optional[str] = None
-    llm_provider: str
-    providers: Dict[str, ProviderDetails]
 
 # --- Pydantic 模型 (无变化) ---
 class PostContent(BaseModel):
@@ -90,13 +396,17 @@ class RenameItem(BaseModel):
 
 # --- 4. 新增配置API Endpoints (新增) ---
 @app.post("/api/config")
-async def update_config(config_data: ConfigModel):
+def update_config(config_data: ConfigModel):
     """接收前端发来的配置，并保存到文件。"""
     global app_config, HEXO_BASE_PATH, POSTS_PATH
     
     # 将接收到的Pydantic模型转换为字典
-    app_config = config_data.dict()
+    app_config = config_data.model_dump()
     save_config(app_config)
+    # 工作目录可能已变化，旧的目录列表缓存全部作废
+    _LISTING_CACHE.clear()
+    _ensured_dirs.clear()
+    _bump_generation()
     
     # 动态更新全局路径变量，以便文件操作API能立即使用新路径
     new_path = app_config.get("hexo_path")
@@ -104,11 +414,13 @@ async def update_config(config_data: ConfigModel):
         # 保存配置但提示路径不存在
         HEXO_BASE_PATH = None
         POSTS_PATH = None
+        _set_posts_root(None)
         raise HTTPException(status_code=400, detail=f"Invalid path provided: {new_path}")
 
     # Path exists; accept it as a workspace root and always scan from root recursively
     HEXO_BASE_PATH = new_path
     POSTS_PATH = HEXO_BASE_PATH  # Always use workspace root
+    _set_posts_root(POSTS_PATH)
 
     # Check if it's a Hexo structure (just for reporting, doesn't affect scanning)
     candidate = os.path.join(HEXO_BASE_PATH, "source", "_posts")
@@ -121,73 +433,246 @@ async def update_config(config_data: ConfigModel):
     }
 
 @app.get("/api/config", response_model=ConfigModel)
-async def get_config():
+async def get_config(request: Request):
     """让前端可以获取当前保存的配置。"""
-    return app_config
-
-# --- 辅助函数 (无变化) ---
-def get_all_md_files(root_dir):
-    md_files = []
-    for dirpath, _, filenames in os.walk(root_dir):
-        for filename in filenames:
-            if filename.endswith(".md"):
-                relative_path = os.path.relpath(os.path.join(dirpath, filename), root_dir)
-                md_files.append(relative_path.replace("\\", "/"))
-    return md_files
-
-def get_all_folders(root_dir):
-    folders = []
-    for dirpath, _, _ in os.walk(root_dir):
-        if dirpath != root_dir:
-            relative_path = os.path.relpath(dirpath, root_dir)
-            folders.append(relative_path.replace("\\", "/"))
-    return folders
+    if _config_json is None:
+        raise HTTPException(status_code=500, detail="Invalid configuration file")
+    if request.headers.get("if-none-match") == _config_etag:
+        return Response(status_code=304, headers={"ETag": _config_etag})
+    return Response(content=_config_json, media_type="application/json", headers={"ETag": _config_etag})
+
+# --- 辅助函数 ---
+def is_pruned_dir(name: str, rel: str) -> bool:
+    """Directories never descended into while listing the workspace.
+
+    name is the directory name and rel its '/'-separated path below the root: _PRUNE_DIRS and
+    dot-directories are skipped at any depth, _ROOT_PRUNE_DIRS only directly under the root.
+    """
+    return name in _PRUNE_DIRS or name.startswith(".") or rel in _ROOT_PRUNE_DIRS
+
+def _iter_tree(root_dir, prune=is_pruned_dir, rel=""):
+    """Yield (relative_path, DirEntry) for everything under root_dir, skipping directories where prune(name, relative_path) is true.
+
+    Uses an explicit stack over os.scandir: DirEntry.is_dir() reuses the d_type returned by
+    the directory read, and relative paths are built by concatenation with '/' so no
+    os.path.relpath / backslash replacement is needed per entry. rel is the prefix
+    ('' or ending in '/') prepended to every yielded path.
+    """
+    stack = [(rel, root_dir)]
+    while stack:
+        rel, path = stack.pop()
+        try:
+            it = os.scandir(path)
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                entry_rel = rel + entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    if prune(entry.name, entry_rel):
+                        continue
+                    stack.append((entry_rel + "/", entry.path))
+                yield entry_rel, entry
+
+# 目录读取受I/O延迟限制时（APFS、NTFS、网络盘），4个线程并发scandir效果最好
+_scan_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="scan")
+
+def _scan_dir(path, rel):
+    """scandir a single directory; return its (relative_path, DirEntry) pairs and the subdirectories to visit."""
+    entries = []
+    subdirs = []
+    try:
+        it = os.scandir(path)
+    except OSError:
+        return entries, subdirs
+    with it:
+        for entry in it:
+            entry_rel = rel + entry.name
+            if entry.is_dir(follow_symlinks=False):
+                if is_pruned_dir(entry.name, entry_rel):
+                    continue
+                subdirs.append((entry.path, entry_rel + "/"))
+            entries.append((entry_rel, entry))
+    return entries, subdirs
+
+def _walk_workspace(root_dir):
+    """Yield (relative_path, DirEntry) for the workspace like _iter_tree, in parallel when enabled.
+
+    In parallel mode every directory is one task on _scan_executor: whenever a task
+    finishes, its entries are yielded and its subdirectories are queued as new tasks,
+    so idle workers always pick up the next pending directory regardless of which
+    subtree it belongs to.
+    """
+    if not _PARALLEL_WALK:
+        yield from _iter_tree(root_dir)
+        return
+    pending = {_scan_executor.submit(_scan_dir, root_dir, "")}
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            entries, subdirs = future.result()
+            pending.update(_scan_executor.submit(_scan_dir, path, rel) for path, rel in subdirs)
+            yield from entries
 
 # 图片文件扩展名
-IMAGE_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.gif', '.webp', '.svg', '.bmp', '.ico'}
-
-def get_all_files(root_dir, extensions=None):
-    """获取所有文件，可选择按扩展名过滤"""
-    files = []
-    for dirpath, _, filenames in os.walk(root_dir):
-        for filename in filenames:
-            if extensions is None or any(filename.lower().endswith(ext) for ext in extensions):
-                relative_path = os.path.relpath(os.path.join(dirpath, filename), root_dir)
-                files.append(relative_path.replace("\\", "/"))
-    return files
-
-def get_image_files(root_dir):
-    """获取所有图片文件"""
-    return get_all_files(root_dir, IMAGE_EXTENSIONS)
+IMAGE_EXTENSIONS = frozenset({'.png', '.jpg', '.jpeg', '.gif', '.webp', '.svg', '.bmp', '.ico'})
+# 扫描时用 rpartition 取后缀，不带点号，省去 splitext 的额外分配
+_IMAGE_SUFFIXES = frozenset(ext[1:] for ext in IMAGE_EXTENSIONS)
+
+def _scan_workspace(root_dir: str) -> Dict[str, List[str]]:
+    """Collect md files, folders and images in a single walk, keyed "posts"/"folders"/"images".
+
+    /api/posts, /api/folders and /api/images are requested together on every refresh and
+    share the result through cached_workspace_scan().
+    """
+    files: List[str] = []
+    folders: List[str] = []
+    images: List[str] = []
+    image_suffixes = _IMAGE_SUFFIXES
+    for rel, entry in _walk_workspace(root_dir):
+        if entry.is_dir(follow_symlinks=False):
+            folders.append(rel)
+            continue
+        name = entry.name
+        if name.endswith(".md"):
+            if entry.is_file():
+                files.append(rel)
+        else:
+            # head 为空说明没有后缀，或是 ".png" 这样的隐藏文件，与 splitext 的行为保持一致
+            head, _, suffix = name.rpartition(".")
+            if head and suffix.lower() in image_suffixes and entry.is_file():
+                images.append(rel)
+    return {"posts": files, "folders": folders, "images": images}
+
+def get_trash_items(trash_root):
+    """Yield everything under .trash in scan order; folders get a trailing '/'."""
+    for rel, entry in _iter_tree(trash_root, prune=lambda name, rel: False):
+        yield rel + "/" if entry.is_dir(follow_symlinks=False) else rel
+
+# --- 目录列表缓存 ---
+# Listings are reused while (root st_mtime_ns, write generation, TTL bucket) is unchanged.
+# The root mtime catches top-level changes made outside the app, every mutating endpoint
+# bumps the write generation, and the TTL bounds staleness for external edits deeper down.
+_LISTING_TTL = 3.0
+# (root, kind) -> (signature, result)；kind为"workspace"（_scan_workspace的结果）或"trash"
+_LISTING_CACHE: Dict[Tuple[str, str], Tuple[Tuple[int, int, int], Any]] = {}
+# 三个列表接口会被前端并发请求，缓存未命中时只让一个线程去扫描
+_scan_lock = threading.Lock()
+_write_generation = 0
+_generation_lock = threading.Lock()
+
+def _bump_generation():
+    global _write_generation
+    with _generation_lock:
+        _write_generation += 1
+
+def _listing_signature(root: str) -> Tuple[int, int, int]:
+    return (os.stat(root).st_mtime_ns, _write_generation, int(time.monotonic() // _LISTING_TTL))
+
+def cached_workspace_scan(root: str, signature) -> Dict[str, List[str]]:
+    """Return _scan_workspace(root), rescanning only when signature differs from the cached one."""
+    key = (root, "workspace")
+    cached = _LISTING_CACHE.get(key)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    with _scan_lock:
+        # 等锁期间可能已有其他请求完成了同一次扫描
+        cached = _LISTING_CACHE.get(key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        result = _scan_workspace(root)
+        _LISTING_CACHE[key] = (signature, result)
+        return result
+
+# 流式输出时每攒够这么多条目才交给StreamingResponse发送一次，避免逐条切换线程
+_STREAM_BATCH = 256
+
+def iter_json_array(items):
+    """Encode an iterable of strings as a JSON array, yielding it in batches as it is produced."""
+    buf = bytearray(b"[")
+    count = 0
+    for item in items:
+        if count:
+            buf += b","
+        buf += dump_json(item)
+        count += 1
+        if count % _STREAM_BATCH == 0:
+            yield bytes(buf)
+            buf.clear()
+    buf += b"]"
+    yield bytes(buf)
+
+def _record_listing(key, signature, items):
+    collected: List[str] = []
+    for item in items:
+        collected.append(item)
+        yield item
+    # 只有完整扫描结束才写入缓存，客户端中途断开不会留下残缺结果
+    _LISTING_CACHE[key] = (signature, collected)
+
+def listing_response(root: str, kind: str, producer) -> Response:
+    """Serve producer(root) as a JSON array.
+
+    A cached listing with a matching signature is sent in one piece; otherwise the walk is
+    streamed to the client as it runs and recorded into the cache once it completes.
+    """
+    key = (root, kind)
+    signature = _listing_signature(root)
+    cached = _LISTING_CACHE.get(key)
+    if cached is not None and cached[0] == signature:
+        return Response(content=dump_json(cached[1]), media_type="application/json")
+    return StreamingResponse(iter_json_array(_record_listing(key, signature, producer(root))),
+                             media_type="application/json")
+
+# 进程级随机盐：重启后写入计数归零，不能让旧ETag误命中
+_ETAG_SALT = os.urandom(4).hex()
+
+def _workspace_listing(request: Request, kind: str) -> Response:
+    """Serve one listing from _scan_workspace() with an ETag derived from the listing signature.
+
+    The signature is checked before scanning, so a client that already has this version
+    gets a 304 without the workspace being walked or anything being serialized.
+    """
+    signature = _listing_signature(POSTS_PATH)
+    etag = '"' + hashlib.blake2b(repr((_ETAG_SALT, POSTS_PATH, kind, signature)).encode(),
+                                 digest_size=8).hexdigest() + '"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    body = dump_json(cached_workspace_scan(POSTS_PATH, signature)[kind])
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
 
 # --- 5. 文件操作API Endpoints (逻辑微调) ---
 # 主要修改：在每个接口的开头都检查POSTS_PATH是否有效
+# 涉及磁盘I/O的接口都声明为普通def：FastAPI会在线程池中执行它们，慢盘上的读写不会阻塞事件循环
 @app.get("/api/posts", response_model=List[str])
-async def list_posts():
+def list_posts(request: Request):
     if not POSTS_PATH or not os.path.exists(POSTS_PATH):
         return []  # 路径未配置或不存在时返回空列表
-    return get_all_md_files(POSTS_PATH)
+    return _workspace_listing(request, "posts")
 
 @app.get("/api/folders", response_model=List[str])
-async def list_folders():
+def list_folders(request: Request):
     if not POSTS_PATH or not os.path.exists(POSTS_PATH):
         return []  # 路径未配置或不存在时返回空列表
-    return get_all_folders(POSTS_PATH)
+    return _workspace_listing(request, "folders")
 
 @app.get("/api/images", response_model=List[str])
-async def list_images():
+def list_images(request: Request):
     """获取所有图片文件"""
     if not POSTS_PATH or not os.path.exists(POSTS_PATH):
         return []
-    return get_image_files(POSTS_PATH)
+    return _workspace_listing(request, "images")
 
 # ... (从这里开始，剩下的所有文件操作API的代码和你的原始文件完全一样) ...
 # ... 你只需把你的原始文件从 @app.get("/api/posts/{filename:path}") 到结尾的所有内容复制粘贴到这里即可 ...
 # ... 为确保完整性，我还是帮你把它们都列出来 ...
 
+# 新文章的front-matter模板，预先编码好，每次只需格式化日期
+_POST_TEMPLATE = b"---\ntitle: New Post\ndate: %s\n---\n\n"
+
 # 重要：/api/posts/new 必须在 /api/posts/{filename:path} 之前定义，否则会被错误匹配
 @app.post("/api/posts/new")
-async def create_post(post: NewPost):
+def create_post(post: NewPost):
     if not POSTS_PATH:
         raise HTTPException(status_code=404, detail="工作目录未配置，请先在Settings中设置路径")
 
@@ -199,37 +684,62 @@ async def create_post(post: NewPost):
     normalized_filename = post.filename.strip().replace('\\', '/')
     
     # Prevent path traversal
-    root = os.path.normpath(os.path.abspath(POSTS_PATH))
-    target = os.path.normpath(os.path.abspath(os.path.join(POSTS_PATH, normalized_filename)))
-    if not (target == root or target.startswith(root + os.sep)):
+    if _UNSAFE_PATH.search(normalized_filename):
         raise HTTPException(status_code=400, detail="无效的文件路径")
+    filepath = os.path.normpath(os.path.join(_POSTS_ROOT_ABS, normalized_filename))
 
-    filepath = target
-    if os.path.exists(filepath):
-        raise HTTPException(status_code=409, detail="文件已存在")
-
-    # Ensure parent folder exists
-    parent_dir = os.path.dirname(filepath)
-    if parent_dir and parent_dir != root:
-        os.makedirs(parent_dir, exist_ok=True)
-
+    # isoformat 与 strftime('%Y-%m-%d %H:%M:%S') 输出相同，但不经过 locale 相关的格式化
+    timestamp = datetime.datetime.utcnow().isoformat(sep=' ', timespec='seconds').encode()
+    data = _POST_TEMPLATE % timestamp
     try:
-        with open(filepath, "w", encoding="utf-8") as f:
-            f.write("---\ntitle: New Post\ndate: {}\n---\n\n".format(datetime.datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')))
-        return {"status": "File created", "path": os.path.relpath(filepath, POSTS_PATH).replace('\\', '/')}
+        # Ensure parent folder exists; O_EXCL replaces the separate exists() check
+        in_parent_dir(filepath, lambda: write_file_bytes(filepath, data, exclusive=True))
+        _bump_generation()
+        return {"status": "File created", "path": workspace_relpath(filepath)}
+    except FileExistsError:
+        raise HTTPException(status_code=409, detail="文件已存在")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"创建文件失败: {str(e)}")
 
 @app.post("/api/folders/new")
-async def create_folder(folder: NewFolder):
+def create_folder(folder: NewFolder):
     if not POSTS_PATH: raise HTTPException(status_code=404, detail="Hexo path not configured.")
     folderpath = os.path.join(POSTS_PATH, folder.path)
     if os.path.exists(folderpath):
         raise HTTPException(status_code=409, detail="Folder already exists")
     os.makedirs(folderpath)
+    _bump_generation()
     return {"status": "Folder created"}
 
 
+_UPLOAD_CHUNK = 1 << 20
+
+def _store_upload(src, target_dir: str, filename: str) -> Dict[str, str]:
+    """Copy an uploaded (spooled) file into target_dir in 1 MiB chunks; runs in the threadpool."""
+    filepath = os.path.join(target_dir, filename)
+    relative_path = workspace_relpath(filepath)
+
+    # 如果文件已存在，直接返回已存在的路径，不重复上传
+    if os.path.exists(filepath):
+        return {"status": "exists", "path": relative_path, "filename": filename}
+
+    def copy():
+        # 分块复制，峰值内存只取决于块大小而不是图片大小
+        with open(filepath, "xb") as out:
+            shutil.copyfileobj(src, out, _UPLOAD_CHUNK)
+
+    try:
+        # 确保目标文件夹存在；缓存的文件夹在应用外被删除时会重新创建后重试
+        in_parent_dir(filepath, copy)
+    except FileExistsError:
+        return {"status": "exists", "path": relative_path, "filename": filename}
+    except Exception as e:
+        if os.path.exists(filepath):
+            os.remove(filepath)  # 不留下写了一半的文件
+        raise HTTPException(status_code=500, detail=f"上传失败: {str(e)}")
+    _bump_generation()
+    return {"status": "uploaded", "path": relative_path, "filename": filename}
+
 @app.post("/api/upload/image")
 async def upload_image(
     file: UploadFile = File(...),
@@ -249,119 +759,174 @@ async def upload_image(
     
     ext = os.path.splitext(filename)[1].lower()
     if ext not in IMAGE_EXTENSIONS:
-        raise HTTPException(status_code=400, detail=f"不支持的图片格式: {ext}，支持: {', '.join(IMAGE_EXTENSIONS)}")
+        raise HTTPException(status_code=400, detail=f"不支持的图片格式: {ext}，支持: {', '.join(sorted(IMAGE_EXTENSIONS))}")
     
-    # 构建目标路径
+    # 构建目标路径（safe_join 同时做安全检查）
     folder = folder.strip().replace('\\', '/')
-    if folder:
-        target_dir = os.path.normpath(os.path.join(POSTS_PATH, folder))
-    else:
-        target_dir = POSTS_PATH
-    
-    # 安全检查
-    root = os.path.normpath(os.path.abspath(POSTS_PATH))
-    if not (target_dir == root or target_dir.startswith(root + os.sep)):
-        raise HTTPException(status_code=400, detail="无效的文件夹路径")
-    
-    # 确保目标文件夹存在
-    os.makedirs(target_dir, exist_ok=True)
-    
-    filepath = os.path.join(target_dir, filename)
-    
-    # 如果文件已存在，直接返回已存在的路径，不重复上传
-    if os.path.exists(filepath):
-        relative_path = os.path.relpath(filepath, POSTS_PATH).replace('\\', '/')
-        return {"status": "exists", "path": relative_path, "filename": filename}
+    target_dir = safe_join(folder, detail="无效的文件夹路径") if folder else _POSTS_ROOT_ABS
     
-    try:
-        contents = await file.read()
-        with open(filepath, "wb") as f:
-            f.write(contents)
-        
-        relative_path = os.path.relpath(filepath, POSTS_PATH).replace('\\', '/')
-        return {"status": "uploaded", "path": relative_path, "filename": filename}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"上传失败: {str(e)}")
+    return await run_in_threadpool(_store_upload, file.file, target_dir, filename)
 
 @app.get("/api/posts/{filename:path}", response_model=str)
-async def get_post(filename: str):
+def get_post(filename: str, request: Request, response: Response):
+    """Return the post as text; answers 304 when If-None-Match carries the current ETag."""
     if not POSTS_PATH: raise HTTPException(status_code=404, detail="Hexo path not configured.")
-    filepath = os.path.join(POSTS_PATH, filename)
-    if not os.path.exists(filepath):
+    filepath = safe_join(filename)
+    try:
+        fd = os.open(filepath, os.O_RDONLY | _O_BINARY)
+    except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
         raise HTTPException(status_code=404, detail="File not found")
-    with open(filepath, "r", encoding="utf-8") as f:
-        return f.read()
+    try:
+        st = os.fstat(fd)
+        if stat.S_ISDIR(st.st_mode):
+            raise HTTPException(status_code=404, detail="File not found")
+        # 大小+修改时间即可识别内容变化，命中时只需一次fstat，不读取文件
+        headers = {
+            "ETag": f'W/"{st.st_size:x}-{st.st_mtime_ns:x}"',
+            "Last-Modified": formatdate(st.st_mtime, usegmt=True),
+            # 有Last-Modified时浏览器可能按启发式规则直接使用缓存，要求每次都先验证
+            "Cache-Control": "no-cache",
+        }
+        if request.headers.get("if-none-match") == headers["ETag"]:
+            return Response(status_code=304, headers=headers)
+        text = read_fd(fd, st.st_size).decode("utf-8")
+    finally:
+        os.close(fd)
+    response.headers.update(headers)
+    # Keep the universal-newline behaviour of the old text-mode read
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
 
 @app.post("/api/posts/{filename:path}")
-async def save_post(filename: str, post: PostContent):
+def save_post(filename: str, post: PostContent):
     if not POSTS_PATH: raise HTTPException(status_code=404, detail="Hexo path not configured.")
-    filepath = os.path.join(POSTS_PATH, filename)
-    os.makedirs(os.path.dirname(filepath), exist_ok=True)
-    with open(filepath, "w", encoding="utf-8") as f:
-        f.write(post.content)
+    filepath = safe_join(filename)
+    data = post.content.encode("utf-8")
+    in_parent_dir(filepath, lambda: write_file_bytes(filepath, data))
+    _bump_generation()
     return {"status": "File saved"}
     
+def move_path(src: str, dest: str):
+    """Rename src to dest in one syscall; only fall back to shutil.move's copy+delete across devices."""
+    try:
+        os.replace(src, dest)
+    except OSError as e:
+        # 其他错误（目标非空、文件被占用等）原样抛出，避免 shutil.move 把源移进已有目录或复制后删除失败
+        if e.errno != errno.EXDEV:
+            raise
+        shutil.move(src, dest)
+
 def ensure_trash_dir():
     if not POSTS_PATH:
         raise HTTPException(status_code=404, detail="Hexo path not configured.")
-    trash_root = os.path.join(POSTS_PATH, ".trash")
-    os.makedirs(trash_root, exist_ok=True)
+    trash_root = trash_root_abs()
+    ensure_dir(trash_root)
     return trash_root
 
 
-def move_to_trash_item(relative_path: str):
-    """Move a file or folder (relative to POSTS_PATH) into a timestamped folder under .trash and return the trash-relative path."""
+# 同一秒内的删除共用一个时间戳目录：(UTC秒数, 时间戳, 目录路径)
+_trash_bucket: Tuple[int, str, str] = (-1, "", "")
+
+def current_trash_bucket(trash_root: str) -> Tuple[str, str]:
+    """Return (timestamp, directory) of the .trash bucket for the current second."""
+    global _trash_bucket
+    now = int(time.time())
+    second, timestamp, bucket_dir = _trash_bucket
+    if now != second or os.path.dirname(bucket_dir) != trash_root:
+        timestamp = time.strftime('%Y%m%dT%H%M%SZ', time.gmtime(now))
+        bucket_dir = trash_root + os.sep + timestamp
+        _trash_bucket = (now, timestamp, bucket_dir)
+    return timestamp, bucket_dir
+
+# 挑选目标位置和移动必须一起完成，否则并发删除同一路径时仍可能互相覆盖
+_trash_lock = threading.Lock()
+
+def _trash_slot_taken(bucket_dir: str, rel: str) -> bool:
+    """True if rel exists in bucket_dir, or one of its parent folders there is a file."""
+    path = bucket_dir
+    for part in rel.split(os.sep)[:-1]:
+        path += os.sep + part
+        try:
+            if not stat.S_ISDIR(os.lstat(path).st_mode):
+                return True
+        except FileNotFoundError:
+            return False
+    return os.path.lexists(path + os.sep + rel.rpartition(os.sep)[2])
+
+def reserve_trash_slot(trash_root: str, rel: str) -> Tuple[str, str]:
+    """Return (timestamp, destination) for moving rel into the current .trash bucket.
+
+    If rel is already taken in that bucket (e.g. a file and then its folder deleted within
+    the same second), roll over to "<timestamp>-1", "<timestamp>-2", ... so an existing
+    trash entry is never replaced or merged into. Call with _trash_lock held.
+    """
+    base, bucket_dir = current_trash_bucket(trash_root)
+    timestamp = base
+    n = 0
+    while _trash_slot_taken(bucket_dir, rel):
+        n += 1
+        timestamp = f"{base}-{n}"
+        bucket_dir = trash_root + os.sep + timestamp
+    return timestamp, bucket_dir + os.sep + rel
+
+def move_to_trash_item(relative_path: str, src_stat: Optional[os.stat_result] = None):
+    """Move a file or folder (relative to POSTS_PATH) into a timestamped folder under .trash and return the trash-relative path.
+
+    Callers that already lstat'ed the source pass the result as src_stat to skip the existence check.
+    """
     trash_root = ensure_trash_dir()
-    timestamp = datetime.datetime.utcnow().strftime('%Y%m%dT%H%M%SZ')
-    src = os.path.join(POSTS_PATH, relative_path)
-    if not os.path.exists(src):
+    src = safe_join(relative_path)
+    if src == _POSTS_ROOT_ABS:
+        raise HTTPException(status_code=400, detail="Invalid path")
+    if src_stat is None and not os.path.lexists(src):
         raise HTTPException(status_code=404, detail="Item not found")
-    dest = os.path.join(trash_root, timestamp, relative_path)
-    os.makedirs(os.path.dirname(dest), exist_ok=True)
-    shutil.move(src, dest)
-    return os.path.join(timestamp, relative_path).replace("\\", "/")
+    # src已规范化，直接切出相对部分拼接，不再对每一段调用os.path.join
+    rel = src[len(_POSTS_ROOT_PREFIX):]
+    with _trash_lock:
+        timestamp, dest = reserve_trash_slot(trash_root, rel)
+        in_parent_dir(dest, lambda: move_path(src, dest))
+    forget_dirs(src)
+    _bump_generation()
+    return timestamp + "/" + workspace_relpath(src)
 
 
 @app.delete("/api/posts/{filename:path}")
-async def delete_post(filename: str):
+def delete_post(filename: str):
     """Soft-delete (move to .trash)."""
     if not POSTS_PATH:
         raise HTTPException(status_code=404, detail="Hexo path not configured.")
+    try:
+        st = os.lstat(safe_join(filename))
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Item not found")
     # Move the file to trash
-    trash_path = move_to_trash_item(filename)
+    trash_path = move_to_trash_item(filename, st)
     return {"status": "moved to trash", "trash_path": trash_path}
 
 
 @app.delete("/api/folders/{path:path}")
-async def delete_folder(path: str):
+def delete_folder(path: str):
     """Soft-delete folder (move to .trash)."""
     if not POSTS_PATH:
         raise HTTPException(status_code=404, detail="Hexo path not configured.")
-    folderpath = os.path.join(POSTS_PATH, path)
-    if not os.path.exists(folderpath):
+    try:
+        st = os.lstat(safe_join(path))
+    except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Folder not found")
     # Move the whole folder to trash preserving its relative path under a timestamped folder
-    trash_path = move_to_trash_item(path)
+    trash_path = move_to_trash_item(path, st)
     return {"status": "moved to trash", "trash_path": trash_path}
 
 
 @app.get("/api/trash", response_model=List[str])
-async def list_trash():
+def list_trash():
     if not POSTS_PATH or not os.path.exists(POSTS_PATH):
         return []  # 路径未配置时返回空列表
-    trash_root = os.path.join(POSTS_PATH, ".trash")
+    trash_root = trash_root_abs()
     if not os.path.exists(trash_root):
         return []
-    items: List[str] = []
-    for dirpath, dirnames, filenames in os.walk(trash_root):
-        for d in dirnames:
-            rel = os.path.relpath(os.path.join(dirpath, d), trash_root)
-            items.append(rel.replace("\\", "/") + "/")
-        for f in filenames:
-            rel = os.path.relpath(os.path.join(dirpath, f), trash_root)
-            items.append(rel.replace("\\", "/"))
-    items.sort()
-    return items
+    return listing_response(trash_root, "trash", get_trash_items)
 
 
 class TrashItem(BaseModel):
@@ -369,12 +934,14 @@ class TrashItem(BaseModel):
 
 
 @app.post("/api/trash/restore")
-async def restore_trash(item: TrashItem):
+def restore_trash(item: TrashItem):
     if not POSTS_PATH:
         raise HTTPException(status_code=404, detail="Hexo path not configured.")
-    trash_root = os.path.join(POSTS_PATH, ".trash")
-    src = os.path.join(trash_root, item.path)
-    if not os.path.exists(src):
+    trash_root = trash_root_abs()
+    src = safe_join(item.path, trash_root)
+    try:
+        os.lstat(src)
+    except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Trash item not found")
 
     # Determine original relative path (strip first timestamp segment)
@@ -384,56 +951,70 @@ async def restore_trash(item: TrashItem):
     else:
         rel = parts[1]
 
-    dest = os.path.join(POSTS_PATH, rel)
+    dest = safe_join(rel)
     if os.path.exists(dest):
         raise HTTPException(status_code=409, detail="Target already exists")
 
-    os.makedirs(os.path.dirname(dest), exist_ok=True)
-    shutil.move(src, dest)
+    in_parent_dir(dest, lambda: move_path(src, dest))
+    forget_dirs(src)
 
     # Cleanup empty timestamp folder if it's empty now
-    parent_ts = os.path.join(trash_root, parts[0])
-    if os.path.isdir(parent_ts) and not any(os.scandir(parent_ts)):
-        os.rmdir(parent_ts)
-
+    parent_ts = trash_root + os.sep + parts[0]
+    try:
+        # with 确保目录句柄立即关闭（Windows上未关闭的句柄会阻止后续rename/rmdir），读到一项即停止
+        with os.scandir(parent_ts) as it:
+            empty = next(it, None) is None
+        if empty:
+            os.rmdir(parent_ts)
+            forget_dirs(parent_ts)
+    except OSError:
+        pass  # 并发恢复同一时间戳目录下的其他条目时，可能已被删除或又有了内容
+
+    _bump_generation()
     return {"status": "restored", "path": rel}
 
 
 @app.delete("/api/trash/{path:path}")
-async def delete_trash(path: str):
+def delete_trash(path: str):
     if not POSTS_PATH:
         raise HTTPException(status_code=404, detail="Hexo path not configured.")
-    trash_root = os.path.join(POSTS_PATH, ".trash")
-    target = os.path.join(trash_root, path)
-    if not os.path.exists(target):
+    target = safe_join(path, trash_root_abs())
+    try:
+        st = os.lstat(target)
+    except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Trash item not found")
-    if os.path.isdir(target):
+    if stat.S_ISDIR(st.st_mode):
         shutil.rmtree(target)
+        forget_dirs(target)
     else:
         os.remove(target)
+    _bump_generation()
     return {"status": "deleted"}
 
 
 @app.delete("/api/trash")
-async def empty_trash():
+def empty_trash():
     """清空整个回收站"""
     if not POSTS_PATH:
         raise HTTPException(status_code=404, detail="Hexo path not configured.")
-    trash_root = os.path.join(POSTS_PATH, ".trash")
+    trash_root = trash_root_abs()
     if os.path.exists(trash_root):
         shutil.rmtree(trash_root)
-        os.makedirs(trash_root, exist_ok=True)  # 重新创建空的.trash文件夹
+        forget_dirs(trash_root)
+        ensure_dir(trash_root)  # 重新创建空的.trash文件夹
+    _bump_generation()
     return {"status": "trash emptied"}
 
 
 @app.post("/api/posts/init")
-async def init_posts_folder():
+def init_posts_folder():
     """Create source/_posts under the configured HEXO_BASE_PATH if possible."""
     if not HEXO_BASE_PATH:
         raise HTTPException(status_code=404, detail="Workspace path not configured.")
     target = os.path.join(HEXO_BASE_PATH, "source", "_posts")
     try:
         os.makedirs(target, exist_ok=True)
+        _bump_generation()
         return {"status": "created", "posts_path": target}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to create posts folder: {e}")
@@ -441,24 +1022,20 @@ async def init_posts_folder():
 
 # --- 6. 移动和重命名API ---
 @app.post("/api/move")
-async def move_item(item: MoveItem):
+def move_item(item: MoveItem):
     """移动文件或文件夹到新位置"""
     if not POSTS_PATH:
         raise HTTPException(status_code=404, detail="Workspace path not configured.")
     
-    source_path = os.path.normpath(os.path.join(POSTS_PATH, item.source))
-    dest_folder = os.path.normpath(os.path.join(POSTS_PATH, item.destination))
-    
     # 安全检查：确保路径在工作目录内
-    root = os.path.normpath(os.path.abspath(POSTS_PATH))
-    if not source_path.startswith(root + os.sep) and source_path != root:
-        raise HTTPException(status_code=400, detail="Invalid source path")
-    if not dest_folder.startswith(root + os.sep) and dest_folder != root:
-        raise HTTPException(status_code=400, detail="Invalid destination path")
+    source_path = safe_join(item.source, detail="Invalid source path")
+    dest_folder = safe_join(item.destination, detail="Invalid destination path")
     
-    if not os.path.exists(source_path):
+    source_stat = stat_or_none(source_path)
+    if source_stat is None:
         raise HTTPException(status_code=404, detail="Source not found")
-    if not os.path.isdir(dest_folder):
+    dest_stat = stat_or_none(dest_folder)
+    if dest_stat is None or not stat.S_ISDIR(dest_stat.st_mode):
         raise HTTPException(status_code=400, detail="Destination is not a folder")
     
     # 获取源文件/文件夹名称
@@ -470,31 +1047,29 @@ async def move_item(item: MoveItem):
         raise HTTPException(status_code=409, detail=f"目标位置已存在同名项目 '{item_name}'，无法移动")
     
     # 防止移动到自己的子目录
-    if os.path.isdir(source_path) and new_path.startswith(source_path + os.sep):
+    if stat.S_ISDIR(source_stat.st_mode) and new_path.startswith(source_path + os.sep):
         raise HTTPException(status_code=400, detail="无法将文件夹移动到自身内部")
     
     try:
-        shutil.move(source_path, new_path)
-        new_relative = os.path.relpath(new_path, POSTS_PATH).replace("\\", "/")
+        move_path(source_path, new_path)
+        forget_dirs(source_path)
+        _bump_generation()
+        new_relative = workspace_relpath(new_path)
         return {"status": "moved", "new_path": new_relative}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to move: {str(e)}")
 
 
 @app.post("/api/rename")
-async def rename_item(item: RenameItem):
+def rename_item(item: RenameItem):
     """重命名文件或文件夹"""
     if not POSTS_PATH:
         raise HTTPException(status_code=404, detail="Workspace path not configured.")
     
-    old_path = os.path.normpath(os.path.join(POSTS_PATH, item.old_path))
-    
     # 安全检查
-    root = os.path.normpath(os.path.abspath(POSTS_PATH))
-    if not old_path.startswith(root + os.sep) and old_path != root:
-        raise HTTPException(status_code=400, detail="Invalid path")
+    old_path = safe_join(item.old_path)
     
-    if not os.path.exists(old_path):
+    if stat_or_none(old_path) is None:
         raise HTTPException(status_code=404, detail="Item not found")
     
     # 验证新名称
@@ -511,40 +1086,70 @@ async def rename_item(item: RenameItem):
     
     try:
         os.rename(old_path, new_path)
-        new_relative = os.path.relpath(new_path, POSTS_PATH).replace("\\", "/")
+        forget_dirs(old_path)
+        _bump_generation()
+        new_relative = workspace_relpath(new_path)
         return {"status": "renamed", "new_path": new_relative}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to rename: {str(e)}")
 
 
 # --- 7. 静态资源API（用于Markdown图片加载）---
-@app.get("/api/assets/{filepath:path}")
-async def get_asset(filepath: str):
-    """提供静态资源文件（图片等）"""
-    if not POSTS_PATH:
-        raise HTTPException(status_code=404, detail="Workspace path not configured.")
-    
-    # URL解码路径
-    from urllib.parse import unquote
-    filepath = unquote(filepath)
-    
-    asset_path = os.path.normpath(os.path.join(POSTS_PATH, filepath))
-    
-    # 安全检查 - 确保路径在工作目录内
-    root = os.path.normpath(os.path.abspath(POSTS_PATH))
-    asset_abs = os.path.normpath(os.path.abspath(asset_path))
-    if not (asset_abs.startswith(root + os.sep) or asset_abs == root):
-        raise HTTPException(status_code=400, detail=f"Invalid path: {filepath}")
-    
-    if not os.path.exists(asset_path):
-        raise HTTPException(status_code=404, detail=f"Asset not found: {filepath}")
-    
-    if os.path.isdir(asset_path):
-        raise HTTPException(status_code=400, detail="Cannot serve directory")
-    
-    # 获取MIME类型
-    mime_type, _ = mimetypes.guess_type(asset_path)
-    if mime_type is None:
-        mime_type = "application/octet-stream"
-    
-    return FileResponse(asset_path, media_type=mime_type)
+# 工作目录中常见的资源类型直接查表；这张表也不受Windows注册表里错误MIME映射的影响
+_ASSET_MEDIA_TYPES = {
+    "png": "image/png", "jpg": "image/jpeg", "jpeg": "image/jpeg", "gif": "image/gif",
+    "webp": "image/webp", "svg": "image/svg+xml", "bmp": "image/bmp", "ico": "image/vnd.microsoft.icon",
+    "md": "text/markdown", "txt": "text/plain",
+}
+
+@functools.lru_cache(maxsize=64)
+def _guess_media_type(suffix: str) -> str:
+    # 与原先的 get_asset 一致：未知类型按二进制处理
+    return mimetypes.guess_type("file." + suffix)[0] or "application/octet-stream"
+
+def asset_media_type(path: str) -> str:
+    """Media type for an asset path: table lookup on the suffix, mimetypes (LRU-cached) on a miss."""
+    suffix = os.path.splitext(path)[1][1:].lower()
+    return _ASSET_MEDIA_TYPES.get(suffix) or _guess_media_type(suffix)
+
+class _WorkspaceStaticFiles(StaticFiles):
+    """StaticFiles that resolves the media type with asset_media_type() instead of mimetypes per request."""
+
+    def file_response(self, full_path, stat_result, scope, status_code=200):
+        response = FileResponse(full_path, status_code=status_code, stat_result=stat_result,
+                                media_type=asset_media_type(os.fspath(full_path)))
+        if self.is_not_modified(response.headers, Headers(scope=scope)):
+            return NotModifiedResponse(response.headers)
+        return response
+
+class WorkspaceAssets:
+    """ASGI app serving files below the current workspace through Starlette's StaticFiles.
+
+    StaticFiles does the stat/open in a worker thread, answers conditional requests and streams
+    the file without a Python-level read/write loop. POSTS_PATH can change at runtime, so the
+    instance is rebuilt lazily whenever the workspace root differs from the one it was built for.
+    """
+
+    def __init__(self):
+        self._cached: Tuple[Optional[str], Optional[StaticFiles]] = (None, None)
+
+    def _static_for(self, directory: str) -> StaticFiles:
+        cached_dir, static = self._cached
+        if static is None or cached_dir != directory:
+            # follow_symlink=True：和以前一样允许工作目录内的符号链接，越界检查仍由StaticFiles完成
+            static = _WorkspaceStaticFiles(directory=directory, check_dir=False, follow_symlink=True)
+            self._cached = (directory, static)
+        return static
+
+    async def __call__(self, scope, receive, send):
+        if not POSTS_PATH:
+            response = JSONResponse({"detail": "Workspace path not configured."}, status_code=404)
+        elif ".." in scope["path"].replace("\\", "/").split("/"):
+            response = JSONResponse({"detail": "Invalid path"}, status_code=400)
+        else:
+            await self._static_for(_POSTS_ROOT_ABS)(scope, receive, send)
+            return
+        await response(scope, receive, send)
+
+
+app.mount("/api/assets", WorkspaceAssets(), name="assets")
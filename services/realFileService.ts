@@ -36,6 +36,8 @@ export interface AppConfig {
     qwen: ProviderConfig;
     deepseek: ProviderConfig;
   };
+  scan_prune?: string[];  // 扫描工作目录时额外跳过的文件夹名
+  parallel_walk?: boolean | null;  // 是否并行扫描工作目录，null表示按平台自动选择
 }
 
 // ----------------------------------------------------
@@ -145,7 +147,8 @@ export const realFileService = { // 注意：这里不再显式声明类型为 F
   listTrash: async (): Promise<string[]> => {
     try {
       const response = await apiClient.get<string[]>('/api/trash');
-      return response.data;
+      // 后端按扫描顺序流式返回，排序后父文件夹总在其内容之前
+      return response.data.sort();
     } catch (error: any) {
       console.error('Failed to list trash:', error);
       return [];